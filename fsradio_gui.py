@@ -13,15 +13,17 @@ Hardening:
 import json
 import re
 import requests
-import socket
+from requests.adapters import HTTPAdapter
 import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 from pathlib import Path
-from typing import Any, Iterable, Optional, List
+from typing import Optional, List, Tuple
 
 import asyncio
-from concurrent.futures import Future
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
 
 try:
     from afsapi import AFSAPI
@@ -38,6 +40,29 @@ DEFAULT_CONFIG = {
     "last_mode": "IRadio"
 }
 
+# shared keep-alive session for the plain-HTTP helpers below
+_HTTP = requests.Session()
+_HTTP.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+_HTTP.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+
+_PATH_RE = re.compile(r"/(device|fsapi)/?$")
+
+VOLUME_DEBOUNCE_MS = 100  # coalesce slider drags into one set_volume per window
+
+_LABEL_KEYS = ("name", "label", "title")
+
+
+def _preset_label(p, idx: int) -> str:
+    if isinstance(p, dict):
+        label = next((p[k] for k in _LABEL_KEYS if p.get(k)), None)
+        if label:
+            return label
+    return f"Preset {idx}"
+
+def _find_mode(modes, value) -> Optional[int]:
+    # last_mode is stored as PlayerMode.key; older configs may hold the short id (e.g. DAB)
+    return next((i for i, m in enumerate(modes) if value in (m.key, m.id)), None)
+
 # -------------------- Async service --------------------
 class RadioService:
     def __init__(self):
@@ -46,6 +71,9 @@ class RadioService:
         self._api: Optional[AFSAPI] = None
         self._connected = False
         self.url_used: Optional[str] = None
+        self._name: Optional[str] = None  # friendly name returned by the connect probe
+        self._modes: Optional[Tuple[str, ...]] = None  # static per device, kept across reconnects
+        self._modes_url: Optional[str] = None  # base URL _modes was fetched from
         self.pin = 1234
         self.timeout = 2
 
@@ -56,10 +84,10 @@ class RadioService:
         self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
         self._thread.start()
 
-    def _run_coro(self, coro) -> Any:
+    def submit(self, coro) -> Future:
+        """Schedule *coro* on the service loop; returns a concurrent Future."""
         self._ensure_loop()
-        fut: Future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        return fut.result()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
 
     @staticmethod
     def _normalize_candidates(user_input: str) -> List[str]:
@@ -70,7 +98,7 @@ class RadioService:
             s = "http://" + s
 
         # If user already gave a path with /device or /fsapi, try as-is first.
-        if re.search(r"/(device|fsapi)(/)?$", s):
+        if _PATH_RE.search(s):
             return [s]
 
         host_port = s.rstrip("/")
@@ -94,94 +122,113 @@ class RadioService:
         self.pin = int(pin)
         self.timeout = int(timeout)
 
-        # Optional DNS/IP check
-        try:
-            host = user_url
-            if host.startswith("http"):
-                host = host.split("://", 1)[1]
-            host = host.split("/", 1)[0]
-            socket.gethostbyname(host.split(":")[0])
-        except Exception:
-            pass
-
-        self._api = None
+        old_api, self._api = self._api, None
         self._connected = False
         self.url_used = None
-        last_err = None
-
-        for base in self._normalize_candidates(user_url):
-            try:
-                async def _create():
-                    api = await AFSAPI.create(base, self.pin, self.timeout)
-                    await api.get_friendly_name()  # probe
-                    return api
-                api = self._run_coro(_create())
-                self._api = api
-                self._connected = True
-                self.url_used = base
-                break
-            except Exception as e:
-                last_err = e
-                continue
-
-        if not self._connected:
+        self._name = None
+        if old_api is not None:
+            self.submit(self._close_api(old_api)).result()
+        candidates = self._normalize_candidates(user_url)
+        try:
+            self.url_used, (self._api, self._name) = self.submit(self._probe_all(candidates)).result()
+            self._connected = True
+        except Exception as last_err:
             raise RuntimeError(
                 "Could not connect to the radio. "
-                f"Tried: {', '.join(self._normalize_candidates(user_url))}. Last error: {last_err}"
-            )
+                f"Tried: {', '.join(candidates)}. Last error: {last_err}"
+            ) from last_err
+
+    async def _probe_all(self, candidates: List[str]):
+        # probe every candidate base concurrently, but take results in listed order
+        # (/device, /fsapi, bare host) so the canonical endpoint wins when it is live
+        tasks = [asyncio.create_task(self._create(base)) for base in candidates]
+        winner, last_err = None, None
+        try:
+            for i, task in enumerate(tasks):
+                try:
+                    result = await task
+                except Exception as e:
+                    last_err = e
+                    continue
+                winner = i
+                return candidates[i], result
+        finally:
+            for task in tasks:
+                task.cancel()
+            # reap every probe (retrieves exceptions) and close clients that lost
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for i, res in enumerate(results):
+                if i != winner and isinstance(res, tuple):
+                    await self._close_api(res[0])
+        raise last_err or RuntimeError("No candidate URLs.")
+
+    async def _create(self, base: str):
+        api = await AFSAPI.create(base, self.pin, self.timeout)
+        try:
+            name = await api.get_friendly_name()  # probe
+        except BaseException:
+            await self._close_api(api)
+            raise
+        return api, name
+
+    @staticmethod
+    async def _close_api(api):
+        # afsapi >= 1.0 keeps a shared HTTP session; older releases have no close()
+        close = getattr(api, "close", None)
+        if close is None:
+            return
+        try:
+            await close()
+        except Exception:
+            pass
 
     def is_connected(self) -> bool:
         return self._connected and self._api is not None
 
-    # ---------- guarded wrappers ----------
+    # ---------- guarded coroutines (schedule via submit) ----------
     def _require(self):
         if not self.is_connected():
             raise RuntimeError("Not connected to a radio.")
 
-    def get_friendly_name(self) -> str:
+    async def get_initial_state(self):
+        """Fetch (name, volume, power, modes, current mode key); modes are refetched only for a new base URL."""
         self._require()
-        async def _c(): return await self._api.get_friendly_name()
-        return self._run_coro(_c())
-
-    def get_power(self) -> bool:
-        self._require()
-        async def _c(): return await self._api.get_power()
-        return bool(self._run_coro(_c()))
+        if self._modes is not None and self._modes_url == self.url_used:
+            vol, power, mode = await asyncio.gather(self.get_volume(), self.get_power(), self._api.get_mode())
+        else:
+            vol, power, mode, modes = await asyncio.gather(
+                self.get_volume(), self.get_power(), self._api.get_mode(), self._api.get_modes()
+            )
+            self._modes, self._modes_url = tuple(modes), self.url_used
+        return self._name, vol, power, self._modes, (mode.key if mode is not None else None)
 
-    def set_power(self, on: bool):
+    async def get_power(self) -> bool:
         self._require()
-        async def _c(): return await self._api.set_power(bool(on))
-        return self._run_coro(_c())
+        return bool(await self._api.get_power())
 
-    def get_volume(self) -> int:
+    async def set_power(self, on: bool):
         self._require()
-        async def _c(): return await self._api.get_volume()
-        return int(self._run_coro(_c()))
+        return await self._api.set_power(bool(on))
 
-    def set_volume(self, value: int):
+    async def get_volume(self) -> int:
         self._require()
-        async def _c(): return await self._api.set_volume(int(value))
-        return self._run_coro(_c())
+        return int(await self._api.get_volume())
 
-    def get_modes(self) -> Iterable[str]:
+    async def set_volume(self, value: int):
         self._require()
-        async def _c(): return await self._api.get_modes()
-        return self._run_coro(_c())
+        return await self._api.set_volume(int(value))
 
-    def set_mode(self, mode: str):
+    async def set_mode(self, mode):
         self._require()
-        async def _c(): return await self._api.set_mode(mode)
-        return self._run_coro(_c())
+        return await self._api.set_mode(mode)
 
-    def get_presets(self):
+    async def get_presets(self):
         self._require()
-        async def _c(): return await self._api.get_presets()
-        return self._run_coro(_c())
+        return await self._api.get_presets()
 
-    def recall_preset(self, preset):
+    async def recall_preset(self, preset):
         self._require()
-        async def _c(): return await self._api.recall_preset(preset)
-        return self._run_coro(_c())
+        return await self._api.recall_preset(preset)
 
 
 # ------------------------------ GUI ------------------------------
@@ -191,10 +238,22 @@ class GuiView(tk.Tk):
         self.title("FSRadio – Remote")
         self.minsize(520, 460)
         self.service = RadioService()
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fsradio")
+        # single worker so config writes land in submission order, never concurrently
+        self._config_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fsradio-config")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._closing = False  # set by on_close; stops worker callbacks from posting to Tk
         self.config_data = self._load_config()
+        self._last_config_bytes: Optional[bytes] = self._config_bytes()  # last bytes known on disk
+        self._config_fut: Optional[Future] = None  # most recent queued config write
         self.preset_buttons = []
+        self._preset_labels: List[str] = []
         self._during_init = False
         self._vol_cmd = None  # keep original command so we can detach/attach safely
+        self._vol_pending = None  # latest slider value not yet sent (last write wins)
+        self._vol_after = None  # pending after() id for the volume flush
+        self._modes: tuple = ()  # PlayerMode objects backing mode_combo, same order
+        self._current_mode: Optional[str] = None  # key of the last mode applied/sent, to skip repeats
 
         # Connection
         top = ttk.LabelFrame(self, text="Connection")
@@ -264,13 +323,9 @@ class GuiView(tk.Tk):
 
         missing = {k: v for k, v in DEFAULT_CONFIG.items() if k not in config or config[k] in ("", None)}
         if missing:
-            import tkinter as tk
-            from tkinter import simpledialog
-            root = tk.Tk()
-            root.withdraw()
             for key, default in missing.items():
                 prompt = f"Enter {key.replace('_', ' ').title()}:"
-                value = simpledialog.askstring("Config Required", prompt, initialvalue=str(default))
+                value = simpledialog.askstring("Config Required", prompt, initialvalue=str(default), parent=self)
                 if key == "last_mode":
                   value = get_last_mode_from_api(config.get("url", default), config.get("pin", default))
                 elif key in ("pin", "timeout"):
@@ -279,7 +334,6 @@ class GuiView(tk.Tk):
                     except Exception:
                         value = default
                 config[key] = value if value not in ("", None) else default
-            root.destroy()
             try:
                 CONFIG_FILE.write_text(json.dumps(config, ensure_ascii=False, indent=2), encoding="utf-8")
             except Exception:
@@ -296,35 +350,71 @@ class GuiView(tk.Tk):
             self.config_data["timeout"] = int(self.timeout_var.get().strip())
         except ValueError:
             self.config_data["timeout"] = DEFAULT_CONFIG["timeout"]
-        try:
-            # this is likely wrong as this is the full info block not the short like IRadio
-            # TODO: build mechanism to correctly extract and persist this information
-            self.config_data["last_mode"] = int(self.mode_combo.get().strip())
-        except ValueError:
-            self.config_data["last_mode"] = DEFAULT_CONFIG["last_mode"]
-        CONFIG_FILE.write_text(json.dumps(self.config_data, ensure_ascii=False, indent=2), encoding="utf-8")
+        idx = self.mode_combo.current()
+        if 0 <= idx < len(self._modes):
+            self.config_data["last_mode"] = self._modes[idx].key
+        data = self._config_bytes()
+        if data == self._last_config_bytes:
+            return
+        self._config_fut = self._config_writer.submit(_write_config, data)
+        self._config_fut.add_done_callback(self._marshal_config)
+
+    def _config_bytes(self) -> bytes:
+        return json.dumps(self.config_data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def _marshal_config(self, fut: Future):
+        self._post(self._on_config_written, fut)
+
+    def _on_config_written(self, fut: Future):
+        err = fut.exception()
+        if err is not None:
+            self._show_error("Config error", f"Could not save {CONFIG_FILE}: {err}")
+        else:
+            self._last_config_bytes = fut.result()
 
     # -------------- helpers --------------
     def _enable_controls(self, on: bool):
+        self._enable_top_controls(on)
+        self._enable_preset_buttons(on)
+
+    def _enable_top_controls(self, on: bool):
         if on:
             self.vol_slider.state(['!disabled'])
             self.mode_combo.state(['readonly', '!disabled'])
-            for b in self.preset_buttons:
-                b.state(['!disabled'])
         else:
             self.vol_slider.state(['disabled'])
             self.mode_combo.state(['disabled'])
-            for b in self.preset_buttons:
-                b.state(['disabled'])
 
-    def _async_call(self, func, *args, on_error: Optional[callable] = None):
-        def worker():
-            try:
-                func(*args)
-            except Exception as ex:
-                err = ex  # bind into closure
-                self.after(0, lambda err=err: (on_error(err) if on_error else messagebox.showerror("Error", str(err))))
-        threading.Thread(target=worker, daemon=True).start()
+    def _enable_preset_buttons(self, on: bool):
+        flag = ['!disabled'] if on else ['disabled']
+        for b in self.preset_buttons:
+            b.state(flag)
+
+    def _async_call(self, coro, on_error: Optional[callable] = None):
+        # single hop: GUI thread -> service loop; result marshalled back via after()
+        fut = self.service.submit(coro)
+        fut.add_done_callback(self._marshal if on_error is None else partial(self._marshal, on_error=on_error))
+
+    def _post(self, func, *args):
+        # called from worker/loop threads; the root is gone (or going) once closing
+        if not self._closing:
+            self.after(0, func, *args)
+
+    def _marshal(self, fut: Future, on_error: Optional[callable] = None):
+        # runs on the completing thread; hand the future to the Tk thread
+        self._post(self._handle_err, fut, on_error)
+
+    def _handle_err(self, fut: Future, on_error: Optional[callable] = None):
+        err = fut.exception()
+        if err is None:
+            return
+        if on_error:
+            on_error(err)
+        else:
+            self._show_error("Error", str(err))
+
+    def _show_error(self, title: str, msg: str):
+        messagebox.showerror(title, msg)
 
     # -------------- events --------------
     def on_connect(self):
@@ -336,28 +426,33 @@ class GuiView(tk.Tk):
         self._during_init = True
         # detach slider command during init to prevent spurious callbacks
         self.vol_slider.configure(command=None)
+        # drop any debounced volume from the previous connection
+        if self._vol_after is not None:
+            self.after_cancel(self._vol_after)
+        self._vol_after = self._vol_pending = None
 
-        def after_ok():
+        def after_ok(state):
             try:
-                name = self.service.get_friendly_name()
-                v = self.service.get_volume()
+                name, v, power, modes, device_mode = state
                 # set slider without callback
                 self.vol_slider.set(v)
-                self.power_var.set(self.service.get_power())
-                modes = list(self.service.get_modes())
-                self.mode_combo["values"] = modes
-                last_mode = self.config_data.get("last_mode")
-                if last_mode in modes:
-                    self.mode_combo.set(last_mode)
+                self.power_var.set(power)
+                self._modes = modes
+                self.mode_combo["values"] = [m.label for m in modes]
+                idx = _find_mode(modes, self.config_data.get("last_mode"))
+                if idx is not None:
+                    self.mode_combo.current(idx)
                 elif modes:
                     self.mode_combo.current(0)
-                self._enable_controls(True)
+                # what the radio is actually playing, not what the combo shows
+                self._current_mode = device_mode
+                self._enable_top_controls(True)
                 self._save_config()
                 self.on_load_presets()
                 used = self.service.url_used or url
                 self.title(f"FSRadio – {name} [{used}]")
             except Exception as ex:
-                messagebox.showerror("Init error", str(ex))
+                self._show_error("Init error", str(ex))
             finally:
                 # re-attach slider command after init
                 self.vol_slider.configure(command=self._vol_cmd)
@@ -366,75 +461,136 @@ class GuiView(tk.Tk):
         def do_connect():
             try:
                 self.service.connect(url, int(pin), int(timeout))
-                self.after(0, after_ok)
             except Exception as ex:
-                err = ex
-                self.after(0, lambda err=err: (messagebox.showerror("Connection failed", str(err)),
-                                               self.vol_slider.configure(command=self._vol_cmd),
-                                               setattr(self, "_during_init", False)))
+                self._post(self._on_connect_failed, "Connection failed", str(ex))
+                return
+            # still on the pool thread: fetch initial state here so the Tk thread never blocks
+            try:
+                state = self.service.submit(self.service.get_initial_state()).result()
+            except Exception as ex:
+                self._post(self._on_connect_failed, "Init error", str(ex))
+                return
+            self._post(after_ok, state)
 
-        threading.Thread(target=do_connect, daemon=True).start()
+        self._pool.submit(do_connect)
+
+    def _on_connect_failed(self, title: str, msg: str):
+        self._show_error(title, msg)
+        self.vol_slider.configure(command=self._vol_cmd)
+        self._during_init = False
 
     def on_power_toggle(self):
         if not self.service.is_connected():
             return
         on = bool(self.power_var.get())
-        self._async_call(self.service.set_power, on)
+        self._async_call(self.service.set_power(on))
 
     def on_volume_change(self, _evt=None):
         if self._during_init or not self.service.is_connected():
             return
-        v = int(float(self.vol_slider.get()))
-        self._async_call(self.service.set_volume, v)
+        self._vol_pending = int(float(self.vol_slider.get()))
+        if self._vol_after is None:
+            self._vol_after = self.after(VOLUME_DEBOUNCE_MS, self._flush_volume)
+
+    def _flush_volume(self):
+        v, self._vol_pending, self._vol_after = self._vol_pending, None, None
+        if v is None or not self.service.is_connected():
+            return
+        self._async_call(self.service.set_volume(v))
 
     def on_mode_change(self):
         if not self.service.is_connected():
             return
-        mode = self.mode_combo.get()
-        self.config_data["last_mode"] = mode
+        idx = self.mode_combo.current()
+        if not 0 <= idx < len(self._modes):
+            return
+        mode = self._modes[idx]
+        if mode.key == self._current_mode:
+            return
+        self._current_mode = mode.key
         self._save_config()
-        self._async_call(self.service.set_mode, mode)
+        self._async_call(self.service.set_mode(mode), on_error=self._on_mode_failed)
 
-    def on_load_presets(self):
-        for child in self.preset_container.winfo_children():
-            child.destroy()
-        self.preset_buttons = []
+    def _on_mode_failed(self, err: Exception):
+        # forget the optimistic mode so re-selecting the same entry retries
+        self._current_mode = None
+        self._show_error("Error", str(err))
 
+    def on_load_presets(self):
         if not self.service.is_connected():
+            self._resize_preset_buttons(0)
             return
 
-        def build_buttons(presets):
-            for idx, p in enumerate(presets, start=1):
-                label = None
-                if isinstance(p, dict):
-                    label = p.get("name") or p.get("label") or p.get("title")
-                if not label:
-                    label = f"Preset {idx}"
-                b = ttk.Button(self.preset_container, text=label, command=lambda pv=p: self.on_preset(pv))
-                b.pack(fill="x", padx=6, pady=3)
-                self.preset_buttons.append(b)
-            self._enable_controls(True)
-
-        def worker():
-            try:
-                presets = self.service.get_presets()
-                self.after(0, lambda presets=presets: build_buttons(presets))
-            except Exception as ex:
-                err = ex
-                self.after(0, lambda err=err: messagebox.showerror("Presets error", str(err)))
+        # single hop: GUI thread -> service loop; result marshalled back via after()
+        fut = self.service.submit(self.service.get_presets())
+        fut.add_done_callback(self._marshal_presets)
 
-        threading.Thread(target=worker, daemon=True).start()
+    def _marshal_presets(self, fut: Future):
+        self._post(self._on_presets_done, fut)
+
+    def _on_presets_done(self, fut: Future):
+        err = fut.exception()
+        if err is not None:
+            self._show_error("Presets error", str(err))
+        else:
+            self._build_preset_buttons(fut.result())
+
+    def _build_preset_buttons(self, presets):
+        presets = list(presets)
+        old_labels = self._preset_labels
+        new_labels = [_preset_label(p, idx) for idx, p in enumerate(presets, start=1)]
+
+        self._resize_preset_buttons(len(new_labels))
+        for i, (label, p) in enumerate(zip(new_labels, presets)):
+            # commands are always rebound: same label does not imply same preset object
+            if i >= len(old_labels) or label != old_labels[i]:
+                self.preset_buttons[i].configure(text=label)
+            self.preset_buttons[i].configure(command=lambda pv=p: self.on_preset(pv))
+        self._preset_labels = new_labels
+        self._enable_preset_buttons(True)
+
+    def _resize_preset_buttons(self, count: int):
+        # only create/destroy the delta; existing buttons are reconfigured in place
+        while len(self.preset_buttons) > count:
+            self.preset_buttons.pop().destroy()
+        while len(self.preset_buttons) < count:
+            b = ttk.Button(self.preset_container)
+            b.pack(fill="x", padx=6, pady=3)
+            self.preset_buttons.append(b)
+        del self._preset_labels[count:]
 
     def on_preset(self, preset):
         if not self.service.is_connected():
             return
-        self._async_call(self.service.recall_preset, preset)
+        self._async_call(self.service.recall_preset(preset))
+
+    def on_close(self):
+        if self._closing:
+            return
+        self._closing = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._config_writer.shutdown(wait=False)
+        # flush queued config writes; keep servicing Tk while waiting, since a blocking
+        # join could deadlock against the writer's done-callback calling after()
+        fut = self._config_fut
+        while fut is not None and not fut.done():
+            self.update()
+            time.sleep(0.01)
+        self.destroy()
+
+
+def _write_config(data: bytes) -> bytes:
+    # write to a temp file and swap it in, so a failed write never truncates the config
+    tmp = CONFIG_FILE.with_name(CONFIG_FILE.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(CONFIG_FILE)
+    return data
 
 
 def get_last_mode_from_api(url, pin):
     try:
         # Example endpoint; adjust as needed for your API
-        response = requests.get(f"{url}/api/status", params={"pin": pin}, timeout=5)
+        response = _HTTP.get(f"{url}/api/status", params={"pin": pin}, timeout=5)
         response.raise_for_status()
         data = response.json()
         # Adjust key as needed based on API response structure